@@ -1,19 +1,34 @@
-from fastapi import FastAPI, Depends, HTTPException
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Depends, HTTPException, Query
 from fastapi.middleware.cors import CORSMiddleware
 from sqlalchemy.orm import Session
 from dotenv import load_dotenv
-from typing import List
+from typing import List, Optional
 import os
 
 # Load environment variables from .env file
 load_dotenv()
 
 from .database import SessionLocal, engine
-from . import models, schemas, crud, scoring, survey_graph
+from . import models, schemas, crud, scoring, survey_graph, search, prompts
 
 models.Base.metadata.create_all(bind=engine)
+search.create_search_index(engine)
 
-app = FastAPI()
+def compile_prompts(db: Session):
+    questions = crud.get_questions(db=db)
+    prompts.compile_question_set([schemas.Question.model_validate(q) for q in questions])
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    db = SessionLocal()
+    try:
+        compile_prompts(db)
+    finally:
+        db.close()
+    yield
+
+app = FastAPI(lifespan=lifespan)
 
 # Add CORS middleware
 app.add_middleware(
@@ -39,7 +54,9 @@ def read_questions(db: Session = Depends(get_db)):
 
 @app.post("/api/questions", response_model=schemas.Question)
 def create_question(question: schemas.QuestionCreate, db: Session = Depends(get_db)):
-    return crud.create_question(db=db, question=question)
+    db_question = crud.create_question(db=db, question=question)
+    compile_prompts(db)
+    return db_question
 
 @app.post("/api/links", response_model=schemas.SurveyLink)
 def create_link(db: Session = Depends(get_db)):
@@ -62,6 +79,27 @@ def create_answer(answer: schemas.AnswerCreate, db: Session = Depends(get_db)):
         score=answer.score
     )
 
+@app.get("/api/answers/search", response_model=schemas.AnswerSearchResults)
+def search_answers(
+    q: str = Query(..., min_length=1),
+    question_id: Optional[int] = None,
+    min_score: Optional[int] = Query(None, ge=1, le=5),
+    max_score: Optional[int] = Query(None, ge=1, le=5),
+    limit: int = Query(20, ge=1, le=100),
+    offset: int = Query(0, ge=0),
+    db: Session = Depends(get_db),
+):
+    total, results = search.search_answers(
+        db=db,
+        query=q,
+        question_id=question_id,
+        min_score=min_score,
+        max_score=max_score,
+        limit=limit,
+        offset=offset,
+    )
+    return {"total": total, "limit": limit, "offset": offset, "results": results}
+
 @app.get("/api/links/{link_id}/answers", response_model=List[schemas.Answer])
 def read_answers_for_link(link_id: int, db: Session = Depends(get_db)):
     answers = crud.get_answers_for_link(db=db, link_id=link_id)
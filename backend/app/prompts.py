@@ -1,9 +1,9 @@
 from langchain_core.prompts import PromptTemplate
 from langchain_core.messages import SystemMessage
 from pydantic import BaseModel
-from typing import Literal
+from typing import Literal, NamedTuple
 from app.llm import llm, mini_llm
-from app.schemas import ResponseClasification, AnswerRecording
+from app.schemas import ResponseClasification, AnswerRecording, Question
 
 response_classifier_system = """
 You are a helpful assistant that classifies responses to questions.
@@ -22,12 +22,14 @@ Here is the question:
 {question}
 Here is the response guidelines:
 {guidelines}
-Here is the conversation history:
-{conversation_history}
 """
 
 response_classifier_prompt = PromptTemplate.from_template(response_classifier_system)
 
+response_classifier_history = """Here is the conversation history:
+{conversation_history}
+"""
+
 response_classifier_llm = mini_llm.with_structured_output(ResponseClasification)
 
 question_generator_system = """
@@ -47,12 +49,14 @@ Here is the question:
 {question}
 Here is the response guidelines:
 {guidelines}
-Here is the last response:
-{last_response}
 """
 
 question_generator_prompt = PromptTemplate.from_template(question_generator_system)
 
+question_generator_history = """Here is the last response:
+{last_response}
+"""
+
 extended_question_generator_system = """
 You are a helpful assistant that generates questions for a survey based on the question guidelines.
 
@@ -66,12 +70,14 @@ Here is the question:
 {question}
 Here is the response guidelines:
 {guidelines}
-Here is the low quality response:
-{conversation_history}
 """
 
 extended_question_generator_prompt = PromptTemplate.from_template(extended_question_generator_system)
 
+extended_question_generator_history = """Here is the low quality response:
+{conversation_history}
+"""
+
 answer_recorder_system = """
 You are a helpful assistant that records answers to questions.
 
@@ -94,14 +100,66 @@ Here is the question:
 {question}
 Here is the response guidelines:
 {guidelines}
-Here is the conversation history:
-{conversation_history}
 """
 
 answer_recorder_prompt = PromptTemplate.from_template(answer_recorder_system)
 
+answer_recorder_history = """Here is the conversation history:
+{conversation_history}
+"""
+
 answer_recorder_llm = llm.with_structured_output(AnswerRecording)
 
 
+# --- Compiled prompt prefixes ---
+#
+# The system prompts above only depend on the question, so they are rendered
+# once per question set instead of on every turn. Each node sends the compiled
+# prefix as the system message and only the conversation history as the
+# trailing human message, which keeps the prompt prefix identical (and
+# cacheable by the provider) across turns on the same question.
+
+class CompiledPrompts(NamedTuple):
+    classifier: str
+    generator: str
+    extended_generator: str
+    recorder: str
+
+
+def _question_key(question: Question) -> tuple:
+    return (question.text, question.guidelines)
+
+
+def compile_question(question: Question) -> CompiledPrompts:
+    """Render every node's system prompt for a single question."""
+    values = {"question": question.text, "guidelines": question.guidelines}
+    return CompiledPrompts(
+        classifier=response_classifier_prompt.format(**values),
+        generator=question_generator_prompt.format(**values),
+        extended_generator=extended_question_generator_prompt.format(**values),
+        recorder=answer_recorder_prompt.format(**values),
+    )
+
+
+_compiled_prompts: dict[tuple, CompiledPrompts] = {}
+
+
+def compile_question_set(questions: list[Question]) -> None:
+    """Replace the compiled snapshot with prompts for ``questions``.
+
+    Call this whenever the question set changes.
+    """
+    global _compiled_prompts
+    _compiled_prompts = {_question_key(q): compile_question(q) for q in questions}
+
 
+def get_compiled_prompts(question: Question) -> CompiledPrompts:
+    """Return the compiled prompts for ``question``.
 
+    Questions outside the current snapshot are compiled on the fly but not
+    stored, so only ``compile_question_set`` decides what the snapshot holds.
+    """
+    compiled = _compiled_prompts.get(_question_key(question))
+    if compiled is None:
+        compiled = compile_question(question)
+    return compiled
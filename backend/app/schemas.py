@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import Optional, Literal
+from typing import List, Optional, Literal
 
 class Question(BaseModel):
     id: int
@@ -60,4 +60,12 @@ class Answer(BaseModel):
 class AnswerCreate(BaseModel):
     text: str
 
+class AnswerSearchHit(Answer):
+    rank: float
+    snippet: str
 
+class AnswerSearchResults(BaseModel):
+    total: int
+    limit: int
+    offset: int
+    results: List[AnswerSearchHit]
@@ -0,0 +1,156 @@
+"""Full-text search over recorded answers.
+
+Answers are indexed in an FTS5 virtual table that mirrors ``answers.text``
+as an external-content table, so the text itself is only stored once.
+Triggers on ``answers`` keep the index in sync with every write path,
+including ``crud.create_answer``.
+
+Existing databases can be backfilled with::
+
+    python -m app.search rebuild
+"""
+import argparse
+from typing import Optional, Sequence, Tuple
+
+from sqlalchemy import RowMapping, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+FTS_TABLE = "answers_fts"
+
+_CREATE_FTS_TABLE = f"""
+CREATE VIRTUAL TABLE {FTS_TABLE} USING fts5(
+    text,
+    content='answers',
+    content_rowid='id',
+    tokenize='porter unicode61'
+)
+"""
+
+_CREATE_TRIGGERS = [
+    f"""
+    CREATE TRIGGER IF NOT EXISTS answers_fts_ai AFTER INSERT ON answers BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, text) VALUES (new.id, new.text);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS answers_fts_ad AFTER DELETE ON answers BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, text) VALUES ('delete', old.id, old.text);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS answers_fts_au AFTER UPDATE OF text ON answers BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, text) VALUES ('delete', old.id, old.text);
+        INSERT INTO {FTS_TABLE}(rowid, text) VALUES (new.id, new.text);
+    END
+    """,
+]
+
+_REBUILD = f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')"
+
+
+def create_search_index(engine: Engine) -> None:
+    """Create the FTS table and its sync triggers if they don't exist yet.
+
+    When the table is created against a database that already holds answers,
+    the index is backfilled immediately.
+    """
+    with engine.begin() as conn:
+        exists = conn.execute(
+            text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"),
+            {"name": FTS_TABLE},
+        ).first()
+        if not exists:
+            conn.execute(text(_CREATE_FTS_TABLE))
+        for trigger in _CREATE_TRIGGERS:
+            conn.execute(text(trigger))
+        if not exists:
+            conn.execute(text(_REBUILD))
+
+
+def rebuild_search_index(engine: Engine) -> None:
+    """Re-index every row of ``answers`` from scratch."""
+    create_search_index(engine)
+    with engine.begin() as conn:
+        conn.execute(text(_REBUILD))
+
+
+def to_match_query(query: str) -> str:
+    """Turn free-form user input into a safe FTS5 MATCH expression.
+
+    Every whitespace-separated term is quoted so punctuation and FTS5 operators
+    in the input are matched literally; terms are implicitly AND-ed. A trailing
+    ``*`` on a term is kept as a prefix search.
+    """
+    terms = []
+    for term in query.split():
+        prefix = term.endswith("*")
+        term = term.rstrip("*")
+        if not term:
+            continue
+        quoted = '"' + term.replace('"', '""') + '"'
+        terms.append(quoted + "*" if prefix else quoted)
+    return " ".join(terms)
+
+
+def search_answers(
+    db: Session,
+    query: str,
+    question_id: Optional[int] = None,
+    min_score: Optional[int] = None,
+    max_score: Optional[int] = None,
+    limit: int = 20,
+    offset: int = 0,
+) -> Tuple[int, Sequence[RowMapping]]:
+    """Return ``(total, rows)`` for answers matching ``query``, best match first.
+
+    Each row carries the answer columns plus its bm25 ``rank`` (lower is better)
+    and a highlighted ``snippet``.
+    """
+    match = to_match_query(query)
+    if not match:
+        return 0, []
+
+    filters = [f"{FTS_TABLE} MATCH :match"]
+    params = {"match": match, "limit": limit, "offset": offset}
+    if question_id is not None:
+        filters.append("a.question_id = :question_id")
+        params["question_id"] = question_id
+    if min_score is not None:
+        filters.append("a.score >= :min_score")
+        params["min_score"] = min_score
+    if max_score is not None:
+        filters.append("a.score <= :max_score")
+        params["max_score"] = max_score
+    # Unfiltered counts can be answered from the index alone.
+    count_from = FTS_TABLE
+    if len(filters) > 1:
+        count_from += f" JOIN answers AS a ON a.id = {FTS_TABLE}.rowid"
+    where = " AND ".join(filters)
+
+    total = db.execute(
+        text(f"SELECT count(*) FROM {count_from} WHERE {where}"),
+        params,
+    ).scalar_one()
+    rows = db.execute(
+        text(
+            f"SELECT a.id, a.question_id, a.link_id, a.text, a.score, "
+            f"bm25({FTS_TABLE}) AS rank, "
+            f"snippet({FTS_TABLE}, 0, '[', ']', '…', 16) AS snippet "
+            f"FROM {FTS_TABLE} JOIN answers AS a ON a.id = {FTS_TABLE}.rowid "
+            f"WHERE {where} ORDER BY rank LIMIT :limit OFFSET :offset"
+        ),
+        params,
+    ).mappings().all()
+    return total, rows
+
+
+if __name__ == "__main__":
+    from .database import engine
+
+    parser = argparse.ArgumentParser(description="Manage the answer search index.")
+    parser.add_argument("command", choices=["rebuild"])
+    args = parser.parse_args()
+
+    rebuild_search_index(engine)
+    print(f"Rebuilt {FTS_TABLE}.")
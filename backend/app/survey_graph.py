@@ -1,16 +1,17 @@
 import uuid
 from typing import List, TypedDict, Any, Annotated
 from langgraph.graph import StateGraph, START, END
-from langchain_core.messages import AIMessage, HumanMessage, RemoveMessage
+from langchain_core.messages import AIMessage, HumanMessage, RemoveMessage, SystemMessage
 from langgraph.graph.message import add_messages, AnyMessage
 from langchain_core.runnables import RunnableConfig
 from app.prompts import (
     response_classifier_llm, 
-    response_classifier_prompt, 
-    question_generator_prompt, 
-    extended_question_generator_prompt,
-    answer_recorder_prompt,
-    answer_recorder_llm
+    response_classifier_history, 
+    question_generator_history, 
+    extended_question_generator_history,
+    answer_recorder_history,
+    answer_recorder_llm,
+    get_compiled_prompts
 )
 from app.llm import llm
 from sqlalchemy.orm import Session
@@ -47,13 +48,12 @@ def classify_response(state: State) -> State:
     """Classify the response to the current question."""
 
     current_question = state["current_question"]
-    question = current_question.text
-    guidelines = current_question.guidelines
-    response = response_classifier_llm.invoke(response_classifier_prompt.format(
-        question=question,
-        guidelines=guidelines,
-        conversation_history=state["current_messages"]
-    ))
+    prompts = get_compiled_prompts(current_question)
+    response = response_classifier_llm.invoke([
+        SystemMessage(content=prompts.classifier),
+        HumanMessage(content=response_classifier_history.format(
+            conversation_history=state["current_messages"]))
+    ])
     return {"classification": response, "messages": [AIMessage(content=f"The classification of the response is {response.classification}. {response.reason}")]}
 
 def generate_question(state: State) -> State:
@@ -72,13 +72,13 @@ def generate_question(state: State) -> State:
     if current_question is None:
         state["current_messages"] = [AIMessage(content="Survey is finished. Thank you for your time!")]
         return state
-    question = current_question.text
-    guidelines = current_question.guidelines
+    prompts = get_compiled_prompts(current_question)
     last_response = state["messages"][-1].content if state["messages"] else None
-    question = llm.invoke(question_generator_prompt.format(
-        question=question,
-        guidelines=guidelines,
-        last_response=last_response))
+    question = llm.invoke([
+        SystemMessage(content=prompts.generator),
+        HumanMessage(content=question_generator_history.format(
+            last_response=last_response))
+    ])
     return {
         "messages": [question],
         "current_messages": [question],
@@ -87,12 +87,12 @@ def generate_question(state: State) -> State:
 def ask_more_details(state: State) -> State:
     """Ask the user for more details."""
     current_question = state["current_question"]
-    question = current_question.text
-    guidelines = current_question.guidelines
-    new_question = llm.invoke(extended_question_generator_prompt.format(
-        question=question,
-        guidelines=guidelines,
-        conversation_history=state["current_messages"]))
+    prompts = get_compiled_prompts(current_question)
+    new_question = llm.invoke([
+        SystemMessage(content=prompts.extended_generator),
+        HumanMessage(content=extended_question_generator_history.format(
+            conversation_history=state["current_messages"]))
+    ])
     return {
         "messages": [new_question], 
         "current_messages": [new_question],
@@ -102,14 +102,14 @@ def ask_more_details(state: State) -> State:
 def record_answer(state: State) -> State:
     """Record the answer to the current question."""
     current_question = state["current_question"]
-    question = current_question.text
-    guidelines = current_question.guidelines
+    prompts = get_compiled_prompts(current_question)
     questions = state["questions"]
     current_messages = state["current_messages"]
-    answer = answer_recorder_llm.invoke(answer_recorder_prompt.format(
-        question=question,
-        guidelines=guidelines,
-        conversation_history=current_messages))
+    answer = answer_recorder_llm.invoke([
+        SystemMessage(content=prompts.recorder),
+        HumanMessage(content=answer_recorder_history.format(
+            conversation_history=current_messages))
+    ])
 
     # record answer to the database
     crud.create_answer(
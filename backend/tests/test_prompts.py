@@ -0,0 +1,195 @@
+import os
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[0].parent))
+os.environ.setdefault("OPENAI_API_KEY", "test")
+
+from langchain_core.messages import AIMessage, HumanMessage, SystemMessage
+
+from app import prompts, survey_graph
+from app.schemas import AnswerRecording, Question, ResponseClasification
+
+QUESTIONS = [
+    Question(id=1, text="What is your name?", guidelines="Provide your full name. e.g. John Doe"),
+    Question(id=2, text="What is your age?", guidelines="Provide your age. e.g. 25"),
+    Question(id=3, text="What is your city?", guidelines="Provide your city. e.g. New York"),
+]
+
+# node -> (compiled field, prefix template, history template, history variable)
+NODES = {
+    "classifier": ("classifier", prompts.response_classifier_prompt, prompts.response_classifier_history, "conversation_history"),
+    "generator": ("generator", prompts.question_generator_prompt, prompts.question_generator_history, "last_response"),
+    "extended_generator": ("extended_generator", prompts.extended_question_generator_prompt, prompts.extended_question_generator_history, "conversation_history"),
+    "recorder": ("recorder", prompts.answer_recorder_prompt, prompts.answer_recorder_history, "conversation_history"),
+}
+
+
+# Single-template prompts as they were before the prefix/history split.
+BASELINE_TEMPLATES = {
+    "classifier": """
+You are a helpful assistant that classifies responses to questions.
+
+You will be given a question and a response.
+
+You will need to classify the response into one of the following categories:
+- skipped: The user explicitly asked to skip the question or declined to answer.
+- answered (high quality): The user answered the question and the answer is high quality.
+- answered (low quality): The user answered the question and the answer is low quality.
+- other: The user answered the question but the answer is not related to the question or asked for clarification/more details.
+
+You will need to provide a reason for your classification.
+
+Here is the question:
+{question}
+Here is the response guidelines:
+{guidelines}
+Here is the conversation history:
+{conversation_history}
+""",
+    "generator": """
+You are a survey facilitator AI. Each turn you’ll receive:
+- The next survey question template (including any quality‐answer guidelines).
+- The expected response format (e.g., scale, free‐text, multiple‐choice).
+- Optionally, the respondent’s last answer.
+
+Your job:
+1. If a previous answer is provided (or if they say they skipped), begin with a brief acknowledgment (e.g., “Thanks for your input!”, "We will come back to this question later.").
+2. Then generate exactly one clear, guideline‐aligned question for the respondent and ask it.
+3. Ensure the question matches the specified format and references any guidance as needed.
+
+Keep each question concise and on‐rails, guiding the respondent smoothly through the survey.
+
+Here is the question:
+{question}
+Here is the response guidelines:
+{guidelines}
+Here is the last response:
+{last_response}
+""",
+    "extended_generator": """
+You are a helpful assistant that generates questions for a survey based on the question guidelines.
+
+The user has already answered the question but it was determined to be low quality.
+
+Your job is to generate a question that is related to the response guidelines and that will help the user provide a high quality answer.
+
+You can ask for clarifications, ask for more details, or ask for a specific example. In your output, you should acknowledge the user's response and then ask the new question.
+
+Here is the question:
+{question}
+Here is the response guidelines:
+{guidelines}
+Here is the low quality response:
+{conversation_history}
+""",
+    "recorder": """
+You are a helpful assistant that records answers to questions.
+
+You will be given a question, a response guidelines, and a conversation history.
+
+You will have to deduce the answer to the question from the conversation history and rate the answer based on the response guidelines.
+
+Rating scale (1 is the lowest quality, 5 is the highest quality):
+1: The answer is not related to the question.
+2: The answer is related to the question but does not provide enough information.
+3: The answer is related to the question and provides enough information.
+4: The answer is related to the question and provides a good answer.
+5: The answer is related to the question and provides a great answer.
+
+Output format:
+answer: <answer>
+score: <score>
+
+Here is the question:
+{question}
+Here is the response guidelines:
+{guidelines}
+Here is the conversation history:
+{conversation_history}
+""",
+}
+
+
+def conversations():
+    """Yield (question, history) for a few turns on each question."""
+    for question in QUESTIONS:
+        history = []
+        for turn in range(4):
+            history.append(HumanMessage(content=f"Answer attempt {turn} for {question.text}"))
+            yield question, list(history)
+            history.append(AIMessage(content=f"Could you tell me more about {question.text.lower()}"))
+
+
+def history_value(variable, history):
+    # generate_question only sees the latest message, the other nodes the whole turn.
+    return history[-1].content if variable == "last_response" else history
+
+
+def render(node, question, history):
+    field, _, history_template, variable = NODES[node]
+    prefix = getattr(prompts.get_compiled_prompts(question), field)
+    return prefix, history_template.format(**{variable: history_value(variable, history)})
+
+
+class RecordingLLM:
+    def __init__(self, result):
+        self.result = result
+        self.calls = []
+
+    def invoke(self, messages):
+        self.calls.append(messages)
+        return self.result
+
+
+def test_compiled_prompts_match_baseline_template():
+    prompts.compile_question_set(QUESTIONS)
+    for node, (_, _, _, variable) in NODES.items():
+        for question, history in conversations():
+            baseline = BASELINE_TEMPLATES[node].format(**{
+                "question": question.text,
+                "guidelines": question.guidelines,
+                variable: history_value(variable, history),
+            })
+            assert "".join(render(node, question, history)) == baseline
+
+
+def test_compiled_prompts_put_static_instructions_first():
+    prompts.compile_question_set(QUESTIONS)
+    for field, _, _, _ in NODES.values():
+        first, second = (getattr(prompts.get_compiled_prompts(q), field) for q in QUESTIONS[:2])
+        shared = os.path.commonprefix([first, second])
+        # Everything up to the question itself is shared across questions.
+        assert shared.endswith("Here is the question:\nWhat is your ")
+        assert "{" not in first
+
+
+def test_classify_response_sends_compiled_prefix_as_system_message(monkeypatch):
+    prompts.compile_question_set(QUESTIONS)
+    llm = RecordingLLM(ResponseClasification(classification="skipped", reason="asked to skip"))
+    monkeypatch.setattr(survey_graph, "response_classifier_llm", llm)
+    history = [HumanMessage(content="skip this one", id="1")]
+
+    survey_graph.classify_response({"current_question": QUESTIONS[0], "current_messages": history})
+
+    system, human = render("classifier", QUESTIONS[0], history)
+    assert llm.calls == [[SystemMessage(content=system), HumanMessage(content=human)]]
+
+
+def test_record_answer_sends_compiled_prefix_as_system_message(monkeypatch):
+    prompts.compile_question_set(QUESTIONS)
+    llm = RecordingLLM(AnswerRecording(answer="John Doe", score=5))
+    monkeypatch.setattr(survey_graph, "answer_recorder_llm", llm)
+    monkeypatch.setattr(survey_graph.crud, "create_answer", lambda **kwargs: None)
+    history = [AIMessage(content="What is your name?", id="1"), HumanMessage(content="John Doe", id="2")]
+
+    survey_graph.record_answer({
+        "current_question": QUESTIONS[0],
+        "questions": list(QUESTIONS[1:]),
+        "current_messages": history,
+        "answers": {},
+        "link_id": 1,
+    })
+
+    system, human = render("recorder", QUESTIONS[0], history)
+    assert llm.calls == [[SystemMessage(content=system), HumanMessage(content=human)]]
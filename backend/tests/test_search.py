@@ -0,0 +1,136 @@
+import os
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[0].parent))
+os.environ.setdefault("OPENAI_API_KEY", "test")
+
+import pytest
+from httpx import AsyncClient, ASGITransport
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app import crud, models, search
+from app.main import app, get_db
+
+
+@pytest.fixture
+def engine():
+    engine = create_engine(
+        "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    models.Base.metadata.create_all(bind=engine)
+    search.create_search_index(engine)
+    return engine
+
+
+@pytest.fixture
+def db(engine):
+    db = sessionmaker(bind=engine)()
+    yield db
+    db.close()
+
+
+def test_search_answers_filters_and_ranks(db):
+    crud.create_answer(db, link_id=1, question_id=1, text="I commute by bike every day", score=5)
+    crud.create_answer(db, link_id=2, question_id=1, text="Bike, bike, bike", score=2)
+    crud.create_answer(db, link_id=3, question_id=2, text="My bike was stolen", score=4)
+    crud.create_answer(db, link_id=4, question_id=2, text="I take the train", score=5)
+
+    total, rows = search.search_answers(db, "bike")
+    assert total == 3
+    assert rows[0]["text"] == "Bike, bike, bike"
+
+    total, rows = search.search_answers(db, "bike", question_id=2)
+    assert [r["link_id"] for r in rows] == [3]
+
+    total, rows = search.search_answers(db, "bike", min_score=4)
+    assert total == 2
+    assert {r["link_id"] for r in rows} == {1, 3}
+
+    total, rows = search.search_answers(db, "bike", limit=1, offset=1)
+    assert total == 3
+    assert len(rows) == 1
+
+
+def test_search_index_follows_updates_and_deletes(db):
+    answer = crud.create_answer(db, link_id=1, question_id=1, text="commuting by car", score=3)
+    assert search.search_answers(db, "commute")[0] == 1
+
+    answer.text = "working from home"
+    db.commit()
+    assert search.search_answers(db, "car")[0] == 0
+    assert search.search_answers(db, "home")[0] == 1
+
+    db.delete(answer)
+    db.commit()
+    assert search.search_answers(db, "home")[0] == 0
+
+
+def test_create_search_index_backfills_existing_answers():
+    engine = create_engine(
+        "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    models.Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine)()
+    crud.create_answer(db, link_id=1, question_id=1, text="answered before indexing", score=3)
+
+    search.create_search_index(engine)
+    assert search.search_answers(db, "indexing")[0] == 1
+    db.close()
+
+
+def test_to_match_query_escapes_operators():
+    assert search.to_match_query('bike OR "car') == '"bike" "OR" """car"'
+    assert search.to_match_query("commut*") == '"commut"*'
+    assert search.to_match_query("  ") == ""
+
+
+@pytest.fixture
+def client(engine):
+    SessionTest = sessionmaker(bind=engine)
+
+    def get_test_db():
+        db = SessionTest()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app.dependency_overrides[get_db] = get_test_db
+    yield AsyncClient(transport=ASGITransport(app=app), base_url="http://test")
+    app.dependency_overrides.pop(get_db)
+
+
+@pytest.mark.asyncio
+async def test_search_endpoint_returns_ranked_hits(client, db):
+    crud.create_answer(db, link_id=1, question_id=1, text="I commute by bike every day", score=5)
+    crud.create_answer(db, link_id=2, question_id=2, text="My bike was stolen", score=2)
+
+    resp = await client.get("/api/answers/search", params={"q": "bike", "min_score": 4, "limit": 5})
+    assert resp.status_code == 200
+    data = resp.json()
+    assert data["total"] == 1
+    assert data["limit"] == 5
+    assert data["offset"] == 0
+    [hit] = data["results"]
+    assert hit["link_id"] == 1
+    assert hit["text"] == "I commute by bike every day"
+    assert hit["snippet"] == "I commute by [bike] every day"
+    assert isinstance(hit["rank"], float)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("params", [
+    {"q": ""},
+    {"q": "bike", "limit": 101},
+    {"q": "bike", "limit": 0},
+    {"q": "bike", "offset": -1},
+    {"q": "bike", "min_score": 0},
+    {"q": "bike", "max_score": 6},
+])
+async def test_search_endpoint_validates_query(client, params):
+    resp = await client.get("/api/answers/search", params=params)
+    assert resp.status_code == 422
+